@@ -1,39 +1,40 @@
 import asyncio
-import aioxmpp
 import websockets
-from typing import Optional, List
 import os
 import logging
 import ssl
-import datetime
 import xml.etree.ElementTree as ET
 from urllib.parse import urlparse
 import base64
 import sys
-import aiohttp
+
+# Shared helpers live in bots-python/ethora_common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from ethora_common.botlog import configure_logging, StanzaLog  # noqa: E402
+from ethora_common.jid import JID  # noqa: E402
 
 
 class EthoraChatBot:
     def __init__(self, jid: str, password: str, room_jid: str, bot_name: str = None, verbose: bool = False):
-        logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO,
-                            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        configure_logging(logging.DEBUG if verbose else None)
         self.logger = logging.getLogger(__name__)
+        self.stanza_log = StanzaLog(self.logger)
 
         # Bot configuration
-        self.jid = aioxmpp.JID.fromstr(jid)
+        self.jid = JID.fromstr(jid)
         self.password = password
-        self.room_jid = aioxmpp.JID.fromstr(room_jid)
+        self.room_jid = JID.fromstr(room_jid)
         self.bot_name = bot_name or "AI Assistant Python"
 
         # Configure connection settings
         self.websocket_url = os.getenv('XMPP_ENDPOINT', 'wss://xmpp.chat.ethora.com:5443/ws')
-        self.logger.info(f"Using WebSocket endpoint: {self.websocket_url}")
+        self.logger.info('Using WebSocket endpoint: %s', self.websocket_url)
 
         parsed_url = urlparse(self.websocket_url)
         self.host = parsed_url.hostname
         self.port = parsed_url.port or 5443
         self.path = parsed_url.path or '/ws'
-        self.logger.info(f"Parsed connection details - Host: {self.host}, Port: {self.port}, Path: {self.path}")
+        self.logger.info('Parsed connection details - Host: %s, Port: %s, Path: %s', self.host, self.port, self.path)
 
         # Set up SSL context
         self.ssl_context = ssl.create_default_context()
@@ -45,10 +46,10 @@ class EthoraChatBot:
     async def _send_stanza(self, stanza: str):
         if self.websocket:
             await self.websocket.send(stanza)
-            self.logger.debug(f"Sent stanza: {stanza}")
+            self.stanza_log.sent('stanza', stanza)
 
     async def _handle_message(self, message: str):
-        self.logger.debug(f"Received stanza: {message}")
+        self.stanza_log.received('stanza', message)
 
         try:
             root = ET.fromstring(message)
@@ -62,11 +63,11 @@ class EthoraChatBot:
         except ET.ParseError:
             self.logger.warning("Failed to parse message XML")
         except Exception as e:
-            self.logger.error(f"Error handling message: {e}", exc_info=True)
+            self.logger.error('Error handling message: %s', e, exc_info=True)
 
     async def _process_message(self, text: str, from_jid: str):
         try:
-            self.logger.info(f"Processing message from {from_jid}: {text}")
+            self.logger.info('Processing message from %s (%d chars)', from_jid, len(text))
 
             # Send 'Processing message...'
             processing_message = (
@@ -79,12 +80,13 @@ class EthoraChatBot:
             )
             # Send the initial "Processing message..." message
             await self.websocket.send(processing_message)
-            self.logger.debug(f"Sent processing message: {processing_message}")
+            self.stanza_log.sent('processing message', processing_message)
 
             response_message = ""
 
             # Check for commands
             if text.startswith("/fact"):
+                import aiohttp  # only this command needs an HTTP client
                 async with aiohttp.ClientSession() as session:
                     async with session.get("https://catfact.ninja/fact?max_length=20") as response:
                         if response.status == 200:
@@ -117,37 +119,37 @@ class EthoraChatBot:
 
             # Send the edited message
             await self.websocket.send(edit_message)
-            self.logger.debug(f"Sent edited message: {edit_message}")
+            self.stanza_log.sent('edited message', edit_message)
 
         except Exception as e:
-            self.logger.error(f"Error processing message: {e}")
+            self.logger.error('Error processing message: %s', e)
 
     async def _connect(self):
         try:
-            self.logger.info(f"Connecting to {self.websocket_url}")
+            self.logger.info('Connecting to %s', self.websocket_url)
             self.websocket = await websockets.connect(self.websocket_url, ssl=self.ssl_context,
                                                       subprotocols=['xmpp-framing'])
             self.logger.info("WebSocket connection established")
 
             stream_header = f'<open xmlns="urn:ietf:params:xml:ns:xmpp-framing" to="{self.jid.domain}" version="1.0"/>'
-            self.logger.debug(f"Sending stream header: {stream_header}")
+            self.stanza_log.sent('stream header', stream_header)
             await self.websocket.send(stream_header)
 
             response = await self.websocket.recv()
-            self.logger.debug(f"Server initial response: {response}")
+            self.stanza_log.received('server initial response', response)
 
             features = await self.websocket.recv()
-            self.logger.debug(f"Stream features: {features}")
+            self.stanza_log.received('stream features', features)
 
             auth_token = self._get_auth_token()
-            self.logger.debug(f"Generated auth token for user: {self.jid.localpart}")
+            self.logger.debug('Generated auth token for user: %s', self.jid.localpart)
 
             auth_stanza = f'<auth xmlns="urn:ietf:params:xml:ns:xmpp-sasl" mechanism="PLAIN">{auth_token}</auth>'
-            self.logger.debug(f"Sending auth stanza: {auth_stanza}")
+            self.stanza_log.sent('auth stanza', auth_stanza)
             await self.websocket.send(auth_stanza)
 
             auth_response = await self.websocket.recv()
-            self.logger.debug(f"Auth response: {auth_response}")
+            self.stanza_log.received('auth response', auth_response)
 
             if '<success' not in auth_response:
                 error_msg = f"Authentication failed. Response: {auth_response}"
@@ -159,34 +161,34 @@ class EthoraChatBot:
             await self.websocket.send(stream_header)
 
             response = await self.websocket.recv()
-            self.logger.debug(f"New stream response: {response}")
+            self.stanza_log.received('new stream response', response)
 
             bind_stanza = f'<iq type="set" id="bind"><bind xmlns="urn:ietf:params:xml:ns:xmpp-bind"><resource>{self.jid.resource or "bot"}</resource></bind></iq>'
-            self.logger.debug(f"Sending bind stanza: {bind_stanza}")
+            self.stanza_log.sent('bind stanza', bind_stanza)
             await self.websocket.send(bind_stanza)
 
             bind_response = await self.websocket.recv()
-            self.logger.debug(f"Bind response: {bind_response}")
+            self.stanza_log.received('bind response', bind_response)
 
             session_stanza = '<iq type="set" id="session"><session xmlns="urn:ietf:params:xml:ns:xmpp-session"/></iq>'
-            self.logger.debug(f"Sending session stanza: {session_stanza}")
+            self.stanza_log.sent('session stanza', session_stanza)
             await self.websocket.send(session_stanza)
 
             session_response = await self.websocket.recv()
-            self.logger.debug(f"Session response: {session_response}")
+            self.stanza_log.received('session response', session_response)
 
             presence = f'<presence to="{self.room_jid}/{self.jid.localpart}"><x xmlns="http://jabber.org/protocol/muc"/><data xmlns="jabber:client" fullName="{self.bot_name}" senderFirstName="{self.bot_name}" senderLastName="Assistant" showInChannel="true"/></presence>'
-            self.logger.debug(f"Sending presence stanza: {presence}")
+            self.stanza_log.sent('presence stanza', presence)
             await self.websocket.send(presence)
 
             welcome_message = f'<message to="{self.room_jid}" type="groupchat"><body>👋 Hello! I\'m {self.bot_name}, your assistant. I\'m here to help answer your questions and participate in discussions. Feel free to chat with me!</body><data xmlns="jabber:client" fullName="{self.bot_name}" senderFirstName="{self.bot_name}" senderLastName="Assistant" showInChannel="true"/></message>'
-            self.logger.debug(f"Sending welcome message: {welcome_message}")
+            self.stanza_log.sent('welcome message', welcome_message)
             await self.websocket.send(welcome_message)
 
             return True
 
         except Exception as e:
-            self.logger.error(f"Connection error: {str(e)}", exc_info=True)
+            self.logger.error('Connection error: %s', e, exc_info=True)
             if self.websocket:
                 await self.websocket.close()
             return False
@@ -194,7 +196,6 @@ class EthoraChatBot:
     def _get_auth_token(self) -> str:
         auth_str = f"\x00{self.jid.localpart}\x00{self.password}"
         token = base64.b64encode(auth_str.encode('utf-8')).decode('utf-8')
-        self.logger.debug(f"Generated auth token for user: {self.jid.localpart}")
         return token
 
     async def _listen(self):
@@ -205,7 +206,7 @@ class EthoraChatBot:
         except websockets.ConnectionClosed:
             self.logger.warning("WebSocket connection closed")
         except Exception as e:
-            self.logger.error(f"Error in message listener: {e}", exc_info=True)
+            self.logger.error('Error in message listener: %s', e, exc_info=True)
 
     async def start(self):
         try:
@@ -216,7 +217,7 @@ class EthoraChatBot:
             else:
                 self.logger.error("Failed to connect")
         except Exception as e:
-            self.logger.error(f"Error starting bot: {e}", exc_info=True)
+            self.logger.error('Error starting bot: %s', e, exc_info=True)
             raise
 
 
@@ -237,18 +238,17 @@ async def main():
 
     try:
         logger.info("Creating bot instance...")
-        bot = EthoraChatBot(jid=bot_jid, password=bot_password, room_jid=room_jid, bot_name=bot_name, verbose=True)
+        bot = EthoraChatBot(jid=bot_jid, password=bot_password, room_jid=room_jid, bot_name=bot_name)
 
         logger.info("Starting bot...")
         await bot.start()
     except Exception as e:
-        logger.error(f"Bot error: {e}", exc_info=True)
+        logger.error('Bot error: %s', e, exc_info=True)
         raise
 
 
 if __name__ == "__main__":
-    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                        handlers=[logging.StreamHandler()])
+    configure_logging()
     logger = logging.getLogger(__name__)
     logger.info("Starting bot script...")
     logger.info("Python version: %s", sys.version)
@@ -0,0 +1 @@
+"""Helpers shared by the Python bots in ``bots-python/``."""
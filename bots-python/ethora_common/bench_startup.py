@@ -0,0 +1,122 @@
+"""
+Startup benchmark for the Python bots.
+
+Imports each bot module in a fresh interpreter and reports the median wall
+time spent importing it plus the process's peak RSS afterwards, for the
+current tree and for a baseline checkout extracted from git:
+
+    cd bots-python && python -m ethora_common.bench_startup [--runs 10] [--baseline-ref REF]
+
+The baseline defaults to the last commit whose requirements still listed
+aioxmpp, i.e. the bots before JID parsing and heavy imports were made lazy.
+Measuring it needs the old dependencies as well as the current ones:
+
+    pip install -r openai-bot-python/requirements.txt aioxmpp
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from io import BytesIO
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+BOTS = {
+    'openai-bot-python': 'ethora_bot',
+    'apiBot': 'main',
+}
+
+_PROBE = """
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'ms': elapsed * 1000, 'rss_kb': rss if sys.platform != 'darwin' else rss // 1024}))
+"""
+
+
+def default_baseline_ref() -> str:
+    """Parent of the commit that dropped aioxmpp from the OpenAI bot's requirements"""
+    removed = subprocess.run(
+        ['git', 'log', '-1', '--format=%H', '-S', 'aioxmpp', '--', 'openai-bot-python/requirements.txt'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    if not removed:
+        raise SystemExit('Could not find a baseline commit; pass --baseline-ref')
+    return f'{removed}^'
+
+
+def extract_tree(ref: str, dest: str) -> str:
+    """Extract bots-python/ at `ref` into `dest`; returns the extracted bots-python path"""
+    toplevel, prefix = subprocess.run(
+        ['git', 'rev-parse', '--show-toplevel', '--show-prefix'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout.splitlines()
+    # git archive refuses to run from a subdirectory, so archive the subtree from the top level
+    archive = subprocess.run(
+        ['git', 'archive', '--format=tar', f'{ref}:{prefix}'],
+        cwd=toplevel, capture_output=True, check=True,
+    ).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(dest)
+    return dest
+
+
+def measure(cwd: str, module: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, '-c', _PROBE, module],
+        cwd=cwd, capture_output=True, text=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'},
+    )
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'unknown error'
+        return {'error': error}
+    return json.loads(proc.stdout)
+
+
+def summarize(tree: str, bot: str, module: str, runs: int) -> dict:
+    # One untimed run first so both trees start from a warm OS file cache
+    measure(os.path.join(tree, bot), module)
+    results = [measure(os.path.join(tree, bot), module) for _ in range(runs)]
+    errors = [r['error'] for r in results if 'error' in r]
+    if errors:
+        return {'error': errors[0]}
+    return {
+        'ms': statistics.median(r['ms'] for r in results),
+        'rss_mb': statistics.median(r['rss_kb'] for r in results) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='interpreters to start per measurement')
+    parser.add_argument('--baseline-ref', help='git ref to compare against (default: see module docstring)')
+    args = parser.parse_args()
+
+    ref = args.baseline_ref or default_baseline_ref()
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_tree = extract_tree(ref, tmp)
+        print(f'baseline: {ref}\n')
+        print(f"{'bot':<20} {'':<9} {'import ms':>10} {'peak RSS MB':>12}")
+        for bot, module in BOTS.items():
+            before = summarize(baseline_tree, bot, module, args.runs)
+            after = summarize(ROOT, bot, module, args.runs)
+            for label, result in (('baseline', before), ('current', after)):
+                if 'error' in result:
+                    print(f'{bot:<20} {label:<9} skipped: {result["error"]}')
+                else:
+                    print(f'{bot:<20} {label:<9} {result["ms"]:>10.1f} {result["rss_mb"]:>12.1f}')
+            if 'error' not in before and 'error' not in after:
+                print(f'{bot:<20} {"change":<9} {after["ms"] / before["ms"] - 1:>+10.0%} '
+                      f'{after["rss_mb"] / before["rss_mb"] - 1:>+12.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Low-overhead logging pipeline for the Python bots.
+
+Records are pushed onto a queue by the event loop and formatted/written by a
+background ``QueueListener`` thread, so a slow stderr never stalls the bot.
+Message arguments are only merged into the text on the listener thread, and
+per-stanza DEBUG output goes through ``StanzaLog`` which can be sampled.
+
+Environment variables (all optional):
+
+    LOG_LEVEL               DEBUG / INFO / WARNING / ... (default INFO)
+    LOG_FORMAT              "text" or "json" (default text)
+    LOG_STANZA_SAMPLE_RATE  fraction of stanzas logged at DEBUG, 0.0-1.0 (default 1.0)
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import math
+import os
+import queue
+import random
+import re
+import sys
+import time
+from typing import Optional
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+REDACTED = '[REDACTED]'
+
+# SASL exchanges carry base64 credentials; message bodies carry user content.
+_SASL_RE = re.compile(
+    r'(<(auth|response|challenge|success)\b[^>]*xmpp-sasl[^>]*>)[^<]*(</\2>)'
+)
+_BODY_RE = re.compile(r'(<body\b[^>]*(?<!/)>).*?(</body>)', re.DOTALL)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def redact(text: str) -> str:
+    """Strip SASL payloads and message bodies from a log line."""
+    if '<' not in text:
+        return text
+    text = _SASL_RE.sub(r'\1' + REDACTED + r'\3', text)
+    return _BODY_RE.sub(r'\1' + REDACTED + r'\2', text)
+
+
+class _RedactingFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        # Covers the message and any traceback text (exceptions may quote stanzas)
+        return redact(super().format(record))
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': redact(record.getMessage()),
+        }
+        if record.exc_info:
+            entry['exc'] = redact(self.formatException(record.exc_info))
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue the record untouched so formatting happens on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class StanzaLog:
+    """
+    DEBUG logging for raw XMPP stanzas, sampled at ``sample_rate``.
+
+    The level check happens before anything else, so at INFO a call costs a
+    single ``isEnabledFor`` lookup.
+    """
+
+    def __init__(self, logger: logging.Logger, sample_rate: Optional[float] = None):
+        self.logger = logger
+        if sample_rate is None:
+            raw = os.getenv('LOG_STANZA_SAMPLE_RATE', '1.0')
+            try:
+                sample_rate = float(raw)
+                if not math.isfinite(sample_rate):
+                    raise ValueError(raw)
+            except ValueError:
+                logger.warning('Invalid LOG_STANZA_SAMPLE_RATE %r, logging every stanza', raw)
+                sample_rate = 1.0
+        self._rate = min(max(sample_rate, 0.0), 1.0)
+
+    def _sampled(self) -> bool:
+        if not self._rate or not self.logger.isEnabledFor(logging.DEBUG):
+            return False
+        return self._rate >= 1.0 or random.random() < self._rate
+
+    def sent(self, label: str, stanza: str):
+        if self._sampled():
+            self.logger.debug('Sent %s: %s', label, stanza)
+
+    def received(self, label: str, stanza: str):
+        if self._sampled():
+            self.logger.debug('Received %s: %s', label, stanza)
+
+
+def configure_logging(level: Optional[int] = None, fmt: Optional[str] = None) -> logging.Logger:
+    """
+    Install the queued pipeline on the root logger.
+
+    Safe to call more than once: the pipeline is only installed on the first
+    call, later calls just adjust the level when one is given.
+    """
+    global _listener
+    root = logging.getLogger()
+
+    if _listener is None:
+        if level is None:
+            level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+            if not isinstance(level, int):
+                level = logging.INFO
+        fmt = (fmt or os.getenv('LOG_FORMAT', 'text')).lower()
+
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(_JsonFormatter() if fmt == 'json' else _RedactingFormatter(TEXT_FORMAT))
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(_LazyQueueHandler(log_queue))
+
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+    if level is not None:
+        root.setLevel(level)
+    return root
+
+
+def _bench(iterations: int = 200_000):
+    """Report per-call cost of a DEBUG stanza log and an INFO line at INFO level."""
+    configure_logging(logging.INFO)
+    logger = logging.getLogger('botlog.bench')
+    stanzas = StanzaLog(logger)
+    stanza = '<message to="room@conference.example" type="groupchat"><body>hi</body></message>'
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        stanzas.received('stanza', stanza)
+    per_debug = (time.perf_counter() - start) / iterations * 1e9
+
+    # Measure the event-loop side only; the records are dropped instead of written.
+    class _Discard:
+        def put_nowait(self, record):
+            pass
+
+    sink = logging.getLogger('botlog.bench.sink')
+    sink.propagate = False
+    sink.addHandler(_LazyQueueHandler(_Discard()))
+    start = time.perf_counter()
+    for _ in range(iterations):
+        sink.info('Processing message from %s (%d chars)', 'room@conference.example/user', 2)
+    per_info = (time.perf_counter() - start) / iterations * 1e9
+
+    print(f'stanza debug (suppressed): {per_debug:.0f} ns/call')
+    print(f'info line (queued):        {per_info:.0f} ns/call')
+
+
+if __name__ == '__main__':
+    _bench()
@@ -0,0 +1,61 @@
+"""
+Watched JSON config file used to reconfigure a running bot.
+
+The watcher polls the file's mtime from the event loop and hands the parsed
+contents to a callback whenever it changes. A file that fails to parse is
+logged and skipped, so the bot keeps running with its previous settings.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+from typing import Awaitable, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+ConfigCallback = Callable[[dict], Union[None, Awaitable[None]]]
+
+
+class ConfigWatcher:
+    def __init__(self, path: str, callback: ConfigCallback, interval: float = 2.0):
+        self.path = path
+        self.callback = callback
+        self.interval = interval
+        self._mtime: Optional[int] = None
+
+    def poll(self) -> Optional[dict]:
+        """Return the file contents if it changed since the last poll, else None."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if mtime == self._mtime:
+            return None
+        self._mtime = mtime
+
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning('Ignoring unreadable config file %s: %s', self.path, e)
+            return None
+        if not isinstance(config, dict):
+            logger.warning('Ignoring config file %s: expected a JSON object', self.path)
+            return None
+        return config
+
+    async def run(self):
+        """Poll until cancelled, applying each change through the callback."""
+        logger.info('Watching %s for config changes', self.path)
+        while True:
+            config = self.poll()
+            if config is not None:
+                try:
+                    result = self.callback(config)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.error('Failed to apply config from %s: %s', self.path, e, exc_info=True)
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,51 @@
+"""
+Minimal JID value type.
+
+The bots only ever split JIDs into localpart / domain / resource and format
+them back into stanzas, so this replaces ``aioxmpp.JID`` (and the cost of
+importing all of aioxmpp) with a cached parser over a ``NamedTuple``. No
+stringprep/PRECIS normalisation is done beyond lowercasing the domain.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+
+class JID(NamedTuple):
+    localpart: Optional[str]
+    domain: str
+    resource: Optional[str] = None
+
+    @staticmethod
+    def fromstr(s: str) -> 'JID':
+        """Parse ``[localpart@]domain[/resource]``; results are cached."""
+        return _parse(s)
+
+    @property
+    def is_bare(self) -> bool:
+        return self.resource is None
+
+    def bare(self) -> 'JID':
+        return self if self.resource is None else JID(self.localpart, self.domain)
+
+    def replace(self, **kwargs) -> 'JID':
+        return self._replace(**kwargs)
+
+    def __str__(self) -> str:
+        s = self.domain
+        if self.localpart:
+            s = f'{self.localpart}@{s}'
+        if self.resource:
+            s = f'{s}/{self.resource}'
+        return s
+
+
+@lru_cache(maxsize=1024)
+def _parse(s: str) -> JID:
+    bare, sep, resource = s.partition('/')
+    localpart, at, domain = bare.partition('@')
+    if not at:
+        localpart, domain = '', bare
+    if not domain or (at and not localpart) or (sep and not resource):
+        raise ValueError(f'Invalid JID: {s!r}')
+    return JID(localpart or None, domain.lower().rstrip('.'), resource or None)
@@ -1,66 +1,222 @@
 # ethora_bot.py
 import asyncio
-import aioxmpp
-import openai
 import websockets
 from typing import Optional, List
 import os
 from dotenv import load_dotenv
 import logging
 import ssl
-import datetime
 import xml.etree.ElementTree as ET
 from urllib.parse import urlparse
 import base64
 import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, fields, replace
+
+# Shared helpers live in bots-python/ethora_common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from ethora_common.botlog import configure_logging, StanzaLog  # noqa: E402
+from ethora_common.hotconfig import ConfigWatcher  # noqa: E402
+from ethora_common.jid import JID  # noqa: E402
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant in a group chat. Keep responses concise and friendly."
+
+@dataclass(frozen=True)
+class BotSettings:
+    """Settings that can be swapped on a running bot without reconnecting"""
+    bot_name: str = "AI Assistant Python"
+    system_prompt: str = DEFAULT_SYSTEM_PROMPT
+    model: str = "gpt-3.5-turbo"
+    max_replies_per_minute: int = 0  # 0 disables the limit
 
 class EthoraChatBot:
-    def __init__(self, jid: str, password: str, room_jid: str, openai_key: str, bot_name: str = None, verbose: bool = False):
+    def __init__(self, jid: str, password: str, room_jid: str, openai_key: str, bot_name: str = None,
+                 verbose: bool = False, config_file: Optional[str] = None):
         # Logging setup first
-        logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO,
-                          format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        configure_logging(logging.DEBUG if verbose else None)
         self.logger = logging.getLogger(__name__)
+        self.stanza_log = StanzaLog(self.logger)
         
         # Bot configuration
-        self.jid = aioxmpp.JID.fromstr(jid)
+        self.jid = JID.fromstr(jid)
         self.password = password
-        self.room_jid = aioxmpp.JID.fromstr(room_jid)
-        self.bot_name = bot_name or "AI Assistant Python"
-        self.message_history: List[dict] = [
-            {"role": "system", "content": "You are a helpful AI assistant in a group chat. Keep responses concise and friendly."}
-        ]
+        self.room_jid = JID.fromstr(room_jid)
+        self.settings = BotSettings(bot_name=bot_name or BotSettings.bot_name)
+        self.message_history: List[dict] = []
+        self._reply_times: deque = deque()
+        
+        # Optional watched config file for live reconfiguration
+        self.config_watcher = None
+        if config_file:
+            self.config_watcher = ConfigWatcher(config_file, self.reconfigure)
+            initial = self.config_watcher.poll()
+            if initial:
+                try:
+                    self.settings, self.room_jid = self._settings_from(initial)
+                except ValueError as e:
+                    self.logger.warning('Ignoring config file %s: %s', config_file, e)
         
         # Configure connection settings
         self.websocket_url = os.getenv('XMPP_ENDPOINT', 'wss://xmpp.chat.ethora.com:5443/ws')
-        self.logger.info(f"Using WebSocket endpoint: {self.websocket_url}")
+        self.logger.info('Using WebSocket endpoint: %s', self.websocket_url)
         
         # Parse the WebSocket URL
         parsed_url = urlparse(self.websocket_url)
         self.host = parsed_url.hostname
         self.port = parsed_url.port or 5443
         self.path = parsed_url.path or '/ws'
-        self.logger.info(f"Parsed connection details - Host: {self.host}, Port: {self.port}, Path: {self.path}")
+        self.logger.info('Parsed connection details - Host: %s, Port: %s, Path: %s', self.host, self.port, self.path)
         
         # Set up SSL context
         self.ssl_context = ssl.create_default_context()
         self.ssl_context.check_hostname = False
         self.ssl_context.verify_mode = ssl.CERT_NONE
         
-        # OpenAI setup
-        self.client = openai.OpenAI(api_key=openai_key)
+        # OpenAI setup (client is created on first use, see `client`)
+        self._openai_key = openai_key
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._client_warmup: Optional[asyncio.Task] = None
         
         # WebSocket connection
         self.websocket = None
         
+    @property
+    def client(self):
+        """
+        OpenAI client, imported and created lazily to keep startup light.
+        Blocking (the import alone is slow), so only touch it from a worker thread.
+        """
+        with self._client_lock:
+            if self._client is None:
+                import openai
+                self._client = openai.OpenAI(api_key=self._openai_key)
+            return self._client
+    
+    def _on_client_warmup_done(self, task: asyncio.Task):
+        """Report a failed background client load instead of leaving it to GC"""
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error('Failed to load the OpenAI client: %s', task.exception(),
+                              exc_info=task.exception())
+    
+    def _complete(self, settings: BotSettings, messages: List[dict]):
+        """Blocking OpenAI call; runs in a worker thread via asyncio.to_thread"""
+        return self.client.chat.completions.create(
+            model=settings.model,
+            messages=messages,
+            temperature=0.7
+        )
+    
+    def _data_tag(self, settings: BotSettings) -> str:
+        """Display metadata attached to every outgoing stanza"""
+        return (
+            f'<data xmlns="jabber:client" fullName="{settings.bot_name}" '
+            f'senderFirstName="{settings.bot_name}" senderLastName="AI" '
+            'showInChannel="true"/>'
+        )
+    
+    def _join_presence(self, settings: BotSettings, history: bool = True) -> str:
+        """MUC join presence for the current room; history=False asks the room not to replay any"""
+        muc = ('<x xmlns="http://jabber.org/protocol/muc"/>' if history else
+               '<x xmlns="http://jabber.org/protocol/muc"><history maxstanzas="0"/></x>')
+        return (
+            f'<presence to="{self.room_jid}/{self.jid.localpart}">'
+            f'{muc}'
+            f'{self._data_tag(settings)}'
+            '</presence>'
+        )
+    
+    def _update_presence(self, settings: BotSettings) -> str:
+        """Presence update for a room we're already in (no MUC <x/>, so not a rejoin)"""
+        return (
+            f'<presence to="{self.room_jid}/{self.jid.localpart}">'
+            f'{self._data_tag(settings)}'
+            '</presence>'
+        )
+    
+    def _settings_from(self, config: dict):
+        """
+        Build new settings and room JID from a config dict, keeping current values for missing keys.
+        Raises ValueError if any value has the wrong type, so a bad file is rejected as a whole.
+        """
+        types = {f.name: f.type for f in fields(BotSettings)}
+        unknown = set(config) - set(types) - {"room_jid"}
+        if unknown:
+            self.logger.warning('Ignoring unknown config keys: %s', ', '.join(sorted(unknown)))
+        
+        changes = {}
+        for key, expected in types.items():
+            if key not in config:
+                continue
+            value = config[key]
+            # type() rather than isinstance() so true/false isn't accepted as an int
+            if type(value) is not expected:
+                raise ValueError(f'{key} must be of type {expected.__name__}, got {value!r}')
+            if expected is str and not value.strip():
+                raise ValueError(f'{key} must not be empty')
+            if expected is int and value < 0:
+                raise ValueError(f'{key} must not be negative')
+            changes[key] = value
+        
+        room_jid = self.room_jid
+        if "room_jid" in config:
+            if not isinstance(config["room_jid"], str):
+                raise ValueError(f'room_jid must be of type str, got {config["room_jid"]!r}')
+            room_jid = JID.fromstr(config["room_jid"])
+        return replace(self.settings, **changes), room_jid
+    
+    async def reconfigure(self, config: dict):
+        """Apply new settings to the running bot; room changes only go through presence"""
+        old_settings, old_room = self.settings, self.room_jid
+        try:
+            new_settings, new_room = self._settings_from(config)
+        except ValueError as e:
+            self.logger.warning('Ignoring config update: %s', e)
+            return
+        
+        # Single assignment, so a reply in flight sees either the old or the new settings
+        self.settings = new_settings
+        
+        if new_room != old_room:
+            self.room_jid = new_room
+            self.message_history = []
+            if self.websocket:
+                await self._send_stanza(f'<presence to="{old_room}/{self.jid.localpart}" type="unavailable"/>')
+                await self._send_stanza(self._join_presence(new_settings, history=False))
+            self.logger.info('Moved from room %s to %s', old_room, new_room)
+        elif new_settings.bot_name != old_settings.bot_name and self.websocket:
+            # Re-send presence so the room picks up the new display name
+            await self._send_stanza(self._update_presence(new_settings))
+        
+        if new_settings != old_settings:
+            changed = [f.name for f in fields(BotSettings)
+                       if getattr(new_settings, f.name) != getattr(old_settings, f.name)]
+            self.logger.info('Applied config changes: %s', ', '.join(changed))
+    
+    def _allow_reply(self, settings: BotSettings) -> bool:
+        """Sliding one-minute window for max_replies_per_minute"""
+        limit = settings.max_replies_per_minute
+        if limit <= 0:
+            return True
+        now = time.monotonic()
+        while self._reply_times and now - self._reply_times[0] >= 60:
+            self._reply_times.popleft()
+        if len(self._reply_times) >= limit:
+            return False
+        self._reply_times.append(now)
+        return True
+    
     async def _send_stanza(self, stanza: str):
         """Send an XMPP stanza over WebSocket"""
         if self.websocket:
             await self.websocket.send(stanza)
-            self.logger.debug(f"Sent stanza: {stanza}")
+            self.stanza_log.sent('stanza', stanza)
     
     async def _handle_message(self, message: str):
         """Handle incoming XMPP stanza"""
-        self.logger.debug(f"Received stanza: {message}")
+        self.stanza_log.received('stanza', message)
         
         try:
             # Parse XML message
@@ -69,88 +225,104 @@ class EthoraChatBot:
             # Check if it's a message stanza
             if root.tag == '{jabber:client}message' and root.get('type') == 'groupchat':
                 body = root.find('{jabber:client}body')
+                # Skip history replayed by the room on join (XEP-0203 delayed delivery)
+                if root.find('{urn:xmpp:delay}delay') is not None:
+                    return
                 if body is not None and body.text:
-                    from_jid = root.get('from')
-                    # Don't respond to our own messages
-                    if self.jid.localpart not in from_jid:
+                    from_jid = root.get('from') or ''
+                    try:
+                        sender = JID.fromstr(from_jid)
+                    except ValueError:
+                        self.logger.warning('Ignoring groupchat message with invalid from %r', from_jid)
+                        return
+                    # Only answer the room we're in; after a room move the old room
+                    # can still deliver messages until it processes our unavailable presence
+                    if sender.bare() != self.room_jid:
+                        return
+                    # Don't respond to our own messages (we join with our localpart as the nick)
+                    if sender.resource != self.jid.localpart:
                         await self._process_message(body.text, from_jid)
         except ET.ParseError:
             self.logger.warning("Failed to parse message XML")
         except Exception as e:
-            self.logger.error(f"Error handling message: {e}", exc_info=True)
+            self.logger.error('Error handling message: %s', e, exc_info=True)
     
     async def _process_message(self, text: str, from_jid: str):
         """Process and respond to a chat message"""
+        # Snapshot once so a concurrent reconfigure can't mix old and new settings in one reply,
+        # or post an answer into a room the question wasn't asked in
+        settings, room_jid, history = self.settings, self.room_jid, self.message_history
         try:
-            self.logger.info(f"Processing message from {from_jid}: {text}")
+            self.logger.info('Processing message from %s (%d chars)', from_jid, len(text))
+            
+            if not self._allow_reply(settings):
+                self.logger.info('Reply limit of %d/min reached, skipping message', settings.max_replies_per_minute)
+                return
             
             # Add user message to history
-            self.message_history.append({
+            history.append({
                 "role": "user",
                 "content": text
             })
             
             # Keep history limited to last 10 messages
-            if len(self.message_history) > 11:  # 1 system message + 10 conversation messages
-                self.message_history = [
-                    self.message_history[0],  # Keep system message
-                    *self.message_history[-10:]  # Keep last 10 messages
-                ]
+            del history[:-10]
             
             # Generate AI response
-            response = await self._generate_response(text)
+            response = await self._generate_response(settings, history)
+            
+            if self.room_jid != room_jid:
+                self.logger.info('Room changed to %s while replying, dropping reply for %s', self.room_jid, room_jid)
+                return
             
             if response:
                 # Add AI response to history
-                self.message_history.append({
+                history.append({
                     "role": "assistant",
                     "content": response
                 })
                 
                 # Send response message
                 message = (
-                    f'<message to="{self.room_jid}" type="groupchat">'
+                    f'<message to="{room_jid}" type="groupchat">'
                     f'<body>{response}</body>'
-                    f'<data xmlns="jabber:client" fullName="{self.bot_name}" '
-                    f'senderFirstName="{self.bot_name}" senderLastName="AI" '
-                    'showInChannel="true"/>'
+                    f'{self._data_tag(settings)}'
                     '</message>'
                 )
                 await self.websocket.send(message)
-                self.logger.debug(f"Sent response message: {message}")
+                self.stanza_log.sent('response message', message)
         
         except Exception as e:
-            self.logger.error(f"Error processing message: {e}", exc_info=True)
+            self.logger.error('Error processing message: %s', e, exc_info=True)
+            if self.room_jid != room_jid:
+                return
             error_message = (
-                f'<message to="{self.room_jid}" type="groupchat">'
+                f'<message to="{room_jid}" type="groupchat">'
                 '<body>Sorry, I encountered an error processing your message.</body>'
-                f'<data xmlns="jabber:client" fullName="{self.bot_name}" '
-                f'senderFirstName="{self.bot_name}" senderLastName="AI" '
-                'showInChannel="true"/>'
+                f'{self._data_tag(settings)}'
                 '</message>'
             )
             await self.websocket.send(error_message)
     
-    async def _generate_response(self, message: str) -> str:
+    async def _generate_response(self, settings: BotSettings, history: List[dict]) -> str:
         """Generate AI response using OpenAI"""
         try:
             completion = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                model="gpt-3.5-turbo",
-                messages=self.message_history,
-                temperature=0.7
+                self._complete,
+                settings,
+                [{"role": "system", "content": settings.system_prompt}, *history]
             )
             
             return completion.choices[0].message.content
             
         except Exception as e:
-            self.logger.error(f"Error generating AI response: {e}", exc_info=True)
+            self.logger.error('Error generating AI response: %s', e, exc_info=True)
             return "Sorry, I encountered an error generating a response."
     
     async def _connect(self):
         """Establish WebSocket connection"""
         try:
-            self.logger.info(f"Connecting to {self.websocket_url}")
+            self.logger.info('Connecting to %s', self.websocket_url)
             self.websocket = await websockets.connect(
                 self.websocket_url,
                 ssl=self.ssl_context,
@@ -163,20 +335,20 @@ class EthoraChatBot:
                 f'<open xmlns="urn:ietf:params:xml:ns:xmpp-framing" '
                 f'to="{self.jid.domain}" version="1.0"/>'
             )
-            self.logger.debug(f"Sending stream header: {stream_header}")
+            self.stanza_log.sent('stream header', stream_header)
             await self.websocket.send(stream_header)
             
             # Wait for server response
             response = await self.websocket.recv()
-            self.logger.debug(f"Server initial response: {response}")
+            self.stanza_log.received('server initial response', response)
             
             # Wait for features
             features = await self.websocket.recv()
-            self.logger.debug(f"Stream features: {features}")
+            self.stanza_log.received('stream features', features)
             
             # Authenticate
             auth_token = self._get_auth_token()
-            self.logger.debug(f"Generated auth token for user: {self.jid.localpart}")
+            self.logger.debug('Generated auth token for user: %s', self.jid.localpart)
             
             auth_stanza = (
                 '<auth xmlns="urn:ietf:params:xml:ns:xmpp-sasl" '
@@ -184,12 +356,12 @@ class EthoraChatBot:
                 f'{auth_token}'
                 '</auth>'
             )
-            self.logger.debug(f"Sending auth stanza: {auth_stanza}")
+            self.stanza_log.sent('auth stanza', auth_stanza)
             await self.websocket.send(auth_stanza)
             
             # Wait for auth response
             auth_response = await self.websocket.recv()
-            self.logger.debug(f"Auth response: {auth_response}")
+            self.stanza_log.received('auth response', auth_response)
             
             if '<success' not in auth_response:
                 error_msg = f"Authentication failed. Response: {auth_response}"
@@ -203,7 +375,7 @@ class EthoraChatBot:
             
             # Wait for new stream response
             response = await self.websocket.recv()
-            self.logger.debug(f"New stream response: {response}")
+            self.stanza_log.received('new stream response', response)
             
             # Bind resource
             bind_stanza = (
@@ -213,12 +385,12 @@ class EthoraChatBot:
                 '</bind>'
                 '</iq>'
             )
-            self.logger.debug(f"Sending bind stanza: {bind_stanza}")
+            self.stanza_log.sent('bind stanza', bind_stanza)
             await self.websocket.send(bind_stanza)
             
             # Wait for bind response
             bind_response = await self.websocket.recv()
-            self.logger.debug(f"Bind response: {bind_response}")
+            self.stanza_log.received('bind response', bind_response)
             
             # Start session
             session_stanza = (
@@ -226,43 +398,35 @@ class EthoraChatBot:
                 '<session xmlns="urn:ietf:params:xml:ns:xmpp-session"/>'
                 '</iq>'
             )
-            self.logger.debug(f"Sending session stanza: {session_stanza}")
+            self.stanza_log.sent('session stanza', session_stanza)
             await self.websocket.send(session_stanza)
             
             # Wait for session response
             session_response = await self.websocket.recv()
-            self.logger.debug(f"Session response: {session_response}")
+            self.stanza_log.received('session response', session_response)
             
             # Join MUC room
-            presence = (
-                f'<presence to="{self.room_jid}/{self.jid.localpart}">'
-                '<x xmlns="http://jabber.org/protocol/muc"/>'
-                f'<data xmlns="jabber:client" fullName="{self.bot_name}" '
-                f'senderFirstName="{self.bot_name}" senderLastName="AI" '
-                'showInChannel="true"/>'
-                '</presence>'
-            )
-            self.logger.debug(f"Sending presence stanza: {presence}")
+            settings = self.settings
+            presence = self._join_presence(settings)
+            self.stanza_log.sent('presence stanza', presence)
             await self.websocket.send(presence)
             
             # Send welcome message
             welcome_message = (
                 f'<message to="{self.room_jid}" type="groupchat">'
-                f'<body>👋 Hello! I\'m {self.bot_name}, an AI assistant powered by OpenAI. '
+                f'<body>👋 Hello! I\'m {settings.bot_name}, an AI assistant powered by OpenAI. '
                 'I\'m here to help answer your questions and participate in discussions. '
                 'Feel free to chat with me!</body>'
-                f'<data xmlns="jabber:client" fullName="{self.bot_name}" '
-                f'senderFirstName="{self.bot_name}" senderLastName="AI" '
-                'showInChannel="true"/>'
+                f'{self._data_tag(settings)}'
                 '</message>'
             )
-            self.logger.debug(f"Sending welcome message: {welcome_message}")
+            self.stanza_log.sent('welcome message', welcome_message)
             await self.websocket.send(welcome_message)
             
             return True
             
         except Exception as e:
-            self.logger.error(f"Connection error: {str(e)}", exc_info=True)
+            self.logger.error('Connection error: %s', e, exc_info=True)
             if self.websocket:
                 await self.websocket.close()
             return False
@@ -272,7 +436,6 @@ class EthoraChatBot:
         # For SASL PLAIN, the format is: \x00username\x00password
         auth_str = f"\x00{self.jid.localpart}\x00{self.password}"
         token = base64.b64encode(auth_str.encode('utf-8')).decode('utf-8')
-        self.logger.debug(f"Generated auth token for user: {self.jid.localpart}")
         return token
     
     async def _listen(self):
@@ -284,7 +447,7 @@ class EthoraChatBot:
         except websockets.ConnectionClosed:
             self.logger.warning("WebSocket connection closed")
         except Exception as e:
-            self.logger.error(f"Error in message listener: {e}", exc_info=True)
+            self.logger.error('Error in message listener: %s', e, exc_info=True)
     
     async def start(self):
         """Start the bot"""
@@ -292,11 +455,21 @@ class EthoraChatBot:
             self.logger.info("Starting bot...")
             if await self._connect():
                 self.logger.info("Bot connected successfully")
-                await self._listen()
+                # Load the OpenAI client off the event loop now, so the first reply doesn't wait for it
+                self._client_warmup = asyncio.create_task(asyncio.to_thread(lambda: self.client))
+                self._client_warmup.add_done_callback(self._on_client_warmup_done)
+                watcher_task = None
+                if self.config_watcher:
+                    watcher_task = asyncio.create_task(self.config_watcher.run())
+                try:
+                    await self._listen()
+                finally:
+                    if watcher_task:
+                        watcher_task.cancel()
             else:
                 self.logger.error("Failed to connect")
         except Exception as e:
-            self.logger.error(f"Error starting bot: {e}", exc_info=True)
+            self.logger.error('Error starting bot: %s', e, exc_info=True)
             raise
 
 async def main():
@@ -310,6 +483,7 @@ async def main():
     room_jid = os.getenv("ROOM_JID")
     openai_key = os.getenv("OPENAI_API_KEY")
     bot_name = os.getenv("BOT_NAME", "AI Assistant Python")
+    config_file = os.getenv("BOT_CONFIG_FILE")
     
     logger.info("Checking environment variables...")
     # Validate required environment variables
@@ -325,9 +499,9 @@ async def main():
         raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
     
     logger.info("Environment variables loaded successfully")
-    logger.info(f"Initializing bot with JID: {bot_jid}")
-    logger.info(f"Target room: {room_jid}")
-    logger.info(f"XMPP endpoint: {os.getenv('XMPP_ENDPOINT', 'wss://xmpp.chat.ethora.com:5443/ws')}")
+    logger.info('Initializing bot with JID: %s', bot_jid)
+    logger.info('Target room: %s', room_jid)
+    logger.info('XMPP endpoint: %s', os.getenv('XMPP_ENDPOINT', 'wss://xmpp.chat.ethora.com:5443/ws'))
     
     try:
         logger.info("Creating bot instance...")
@@ -337,24 +511,19 @@ async def main():
             room_jid=room_jid,
             openai_key=openai_key,
             bot_name=bot_name,
-            verbose=True
+            config_file=config_file
         )
         
         logger.info("Starting bot...")
         await bot.start()
     except Exception as e:
-        logger.error(f"Bot error: {e}", exc_info=True)
+        logger.error('Bot error: %s', e, exc_info=True)
         raise
 
 if __name__ == "__main__":
-    # Configure logging first
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler()
-        ]
-    )
+    # Configure logging first (LOG_LEVEL / LOG_FORMAT may come from .env)
+    load_dotenv()
+    configure_logging()
     logger = logging.getLogger(__name__)
     logger.info("Starting bot script...")
     logger.info("Python version: %s", sys.version)
@@ -1,115 +1,323 @@
 #!/usr/bin/env python3
 """
-Test script for the OpenAI Bot API
-Demonstrates how to create and manage bot instances
+Load-testing tool for the OpenAI Bot API
+Provisions, lists and deletes bot instances concurrently and reports
+latency percentiles and errors per endpoint.
+
+Examples:
+    python test-api.py                                  # create/list/delete against localhost:3000
+    python test-api.py --stub --count 500 --concurrency 50
+    python test-api.py --scenario create --specs config/test-bots.json --count 200
+    python test-api.py --scenario delete --id-prefix load-
+
+Requires aiohttp (pip install aiohttp).
 """
 
-import requests
+import argparse
+import asyncio
+import itertools
 import json
+import os
+import re
+import sys
 import time
+from collections import Counter, defaultdict
+from typing import List, Optional
+
+import aiohttp
+from aiohttp import web
 
 # API Configuration
 API_URL = "http://localhost:3000"
 API_KEY = "test_secret_key_123"
+DEFAULT_SPECS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "test-bots.json")
+
+# Any token containing a digit (bot ids, timestamps) is collapsed so errors group by kind
+_ID_TOKEN_RE = re.compile(r"\S*\d\S*")
+
+REQUIRED_FIELDS = ["xmppUsername", "xmppPassword", "firstName", "lastName", "chatroomJid"]
+
+
+class Stats:
+    """Latency samples and error counts, keyed by endpoint"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+        self.examples = {}
+
+    def record(self, endpoint: str, seconds: float, error: Optional[str] = None, detail: str = ""):
+        """Record one request; errors are grouped by `error` plus `detail` with ids stripped"""
+        self.latencies[endpoint].append(seconds * 1000)
+        if error:
+            key = f"{error} {_ID_TOKEN_RE.sub('<id>', detail)}".strip()
+            self.errors[endpoint][key] += 1
+            self.examples.setdefault((endpoint, key), detail)
+
+    @property
+    def error_count(self) -> int:
+        return sum(sum(counter.values()) for counter in self.errors.values())
+
+    def report(self, wall_seconds: float):
+        print(f"\n{'endpoint':<30} {'count':>6} {'errors':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  (ms)")
+        total = 0
+        for endpoint, samples in self.latencies.items():
+            samples = sorted(samples)
+            total += len(samples)
+            print(
+                f"{endpoint:<30} {len(samples):>6} {sum(self.errors[endpoint].values()):>6} "
+                f"{percentile(samples, 50):>8.1f} {percentile(samples, 90):>8.1f} "
+                f"{percentile(samples, 99):>8.1f} {samples[-1]:>8.1f}"
+            )
+        print(f"\n{total} requests in {wall_seconds:.2f}s ({total / wall_seconds:.1f} req/s)")
+
+        if self.error_count:
+            print("\nErrors:")
+            for endpoint, counter in self.errors.items():
+                for error, count in counter.most_common():
+                    print(f"  {endpoint:<30} {count:>6}  {error}")
+                    example = self.examples[(endpoint, error)]
+                    if example and "<id>" in error:
+                        print(f"  {'':<30} {'':>6}  e.g. {example}")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class ApiClient:
+    """Thin wrapper around a pooled session that times every request"""
+
+    def __init__(self, session: aiohttp.ClientSession, base_url: str, stats: Stats, concurrency: int):
+        self.session = session
+        self.base_url = base_url.rstrip("/")
+        self.stats = stats
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(self, method: str, endpoint: str, path: str, **kwargs):
+        """Send one request; returns the decoded JSON body, or None on any error"""
+        async with self.semaphore:
+            start = time.perf_counter()
+            try:
+                async with self.session.request(method, self.base_url + path, **kwargs) as response:
+                    text = await response.text(errors="replace")
+                    elapsed = time.perf_counter() - start
+                    try:
+                        body = json.loads(text)
+                    except ValueError:
+                        body = None
+
+                    if response.status >= 400:
+                        # Proxies and Express's own 404/413/body-parser errors reply with HTML, not JSON
+                        if isinstance(body, dict) and body.get("error"):
+                            detail = str(body["error"])
+                        else:
+                            detail = response.reason or " ".join(text[:80].split())
+                        self.stats.record(endpoint, elapsed, f"HTTP {response.status}", detail)
+                        return None
+                    if body is None:
+                        self.stats.record(endpoint, elapsed, f"HTTP {response.status}", "response is not JSON")
+                        return None
+                    self.stats.record(endpoint, elapsed)
+                    return body
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.stats.record(endpoint, time.perf_counter() - start, type(e).__name__)
+                return None
+
+    async def health(self):
+        return await self.request("GET", "GET /health", "/health")
+
+    async def list_bots(self, endpoint: str = "GET /api/bots"):
+        return await self.request("GET", endpoint, "/api/bots")
+
+    async def get_bot(self, bot_id: str):
+        return await self.request("GET", "GET /api/bots/:id", f"/api/bots/{bot_id}")
+
+    async def create_bot(self, spec: dict):
+        return await self.request("POST", "POST /api/bots", "/api/bots", json=spec)
+
+    async def delete_bot(self, bot_id: str):
+        return await self.request("DELETE", "DELETE /api/bots/:id", f"/api/bots/{bot_id}")
+
+
+def load_specs(path: str, count: int, id_prefix: str) -> List[dict]:
+    """Cycle through the spec file until `count` bots, each with a unique id"""
+    with open(path, encoding="utf-8") as f:
+        templates = json.load(f)
+    if not templates:
+        raise ValueError(f"No bot specs in {path}")
+
+    specs = []
+    for i, template in zip(range(count), itertools.cycle(templates)):
+        spec = dict(template)
+        spec["id"] = f"{id_prefix}{i:05d}"
+        specs.append(spec)
+    return specs
+
+
+async def scenario_create(client: ApiClient, specs: List[dict]) -> List[str]:
+    print(f"Creating {len(specs)} bots...")
+    results = await asyncio.gather(*(client.create_bot(spec) for spec in specs))
+    return [result["id"] for result in results if result]
+
+
+async def scenario_list(client: ApiClient, count: int):
+    print(f"Listing bots {count} times...")
+    await asyncio.gather(*(client.list_bots() for _ in range(count)))
+
+
+async def scenario_get(client: ApiClient, bot_ids: List[str]):
+    print(f"Fetching {len(bot_ids)} bots...")
+    await asyncio.gather(*(client.get_bot(bot_id) for bot_id in bot_ids))
+
+
+async def scenario_delete(client: ApiClient, id_prefix: str):
+    # Recorded under its own label so it doesn't skew the list scenario's numbers
+    bots = await client.list_bots(endpoint="GET /api/bots (discovery)")
+    if not isinstance(bots, list):
+        bots = []
+    bot_ids = [
+        bot["id"] for bot in bots
+        if isinstance(bot, dict) and isinstance(bot.get("id"), str) and bot["id"].startswith(id_prefix)
+    ]
+    print(f"Deleting {len(bot_ids)} bots with id prefix '{id_prefix}'...")
+    await asyncio.gather(*(client.delete_bot(bot_id) for bot_id in bot_ids))
+
+
+def create_stub_app(api_key: str, latency: float) -> web.Application:
+    """In-memory stand-in for the bot manager API (see src/api/server.ts)"""
+    bots = {}
+
+    @web.middleware
+    async def authenticate(request, handler):
+        if request.path.startswith("/api/") and request.headers.get("Authorization") != f"Bearer {api_key}":
+            return web.json_response({"error": "Unauthorized"}, status=401)
+        if latency:
+            await asyncio.sleep(latency)
+        return await handler(request)
+
+    def describe(config):
+        return {"id": config["id"], "active": True, "config": config}
+
+    async def health(request):
+        return web.json_response({"status": "ok", "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())})
+
+    async def list_bots(request):
+        return web.json_response([describe(config) for config in bots.values()])
+
+    async def get_bot(request):
+        config = bots.get(request.match_info["id"])
+        if not config:
+            return web.json_response({"error": "Bot instance not found"}, status=404)
+        return web.json_response(describe(config))
+
+    async def create_bot(request):
+        body = await request.json()
+        config = {field: body.get(field) for field in REQUIRED_FIELDS}
+        config["id"] = body.get("id") or f"bot-{int(time.time() * 1000)}"
+        config["systemPrompt"] = body.get("systemPrompt") or "You are a helpful AI assistant."
+        for field in REQUIRED_FIELDS:
+            if not config[field]:
+                return web.json_response({"error": f"Missing required field: {field}"}, status=400)
+        if config["id"] in bots:
+            return web.json_response({"error": f"Bot instance with ID {config['id']} already exists"}, status=400)
+        bots[config["id"]] = config
+        return web.json_response(describe(config), status=201)
+
+    async def delete_bot(request):
+        bot_id = request.match_info["id"]
+        if bots.pop(bot_id, None) is None:
+            return web.json_response({"error": f"Bot instance with ID {bot_id} not found"}, status=404)
+        return web.json_response({"message": "Bot instance removed successfully"})
+
+    app = web.Application(middlewares=[authenticate])
+    app.router.add_get("/health", health)
+    app.router.add_get("/api/bots", list_bots)
+    app.router.add_get("/api/bots/{id}", get_bot)
+    app.router.add_post("/api/bots", create_bot)
+    app.router.add_delete("/api/bots/{id}", delete_bot)
+    return app
+
+
+async def start_stub(api_key: str, latency: float):
+    """Start the stub server on a free local port; returns (runner, base_url)"""
+    runner = web.AppRunner(create_stub_app(api_key, latency), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+async def run(args) -> int:
+    stub_runner = None
+    base_url = args.url
+    if args.stub:
+        stub_runner, base_url = await start_stub(args.api_key, args.stub_latency / 1000)
+        print(f"Stub server listening on {base_url}")
+
+    stats = Stats()
+    headers = {"Authorization": f"Bearer {args.api_key}"}
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+
+    started = time.perf_counter()
+    try:
+        async with aiohttp.ClientSession(headers=headers, connector=connector, timeout=timeout) as session:
+            client = ApiClient(session, base_url, stats, args.concurrency)
+
+            if await client.health() is None:
+                print(f"ERROR: Could not reach the API server at {base_url}.")
+                print("Make sure the bot manager is running with: npm run dev (or pass --stub)")
+                return 1
+
+            if args.scenario in ("create", "all"):
+                specs = load_specs(args.specs, args.count, args.id_prefix)
+                created = await scenario_create(client, specs)
+                if args.scenario == "all":
+                    await scenario_get(client, created)
+            if args.scenario in ("list", "all"):
+                await scenario_list(client, args.count)
+            if args.scenario in ("delete", "all"):
+                await scenario_delete(client, args.id_prefix)
+    finally:
+        if stub_runner:
+            await stub_runner.cleanup()
+
+    stats.report(time.perf_counter() - started)
+    return 1 if stats.error_count else 0
 
-headers = {
-    "Authorization": f"Bearer {API_KEY}",
-    "Content-Type": "application/json"
-}
-
-def test_health():
-    """Test the health endpoint"""
-    print("1. Testing Health Endpoint...")
-    response = requests.get(f"{API_URL}/health")
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}\n")
-
-def get_all_bots():
-    """Get all bot instances"""
-    print("Getting all bot instances...")
-    response = requests.get(f"{API_URL}/api/bots", headers=headers)
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}\n")
-    return response.json()
-
-def create_bot(bot_data):
-    """Create a new bot instance"""
-    print(f"Creating bot: {bot_data['firstName']} {bot_data['lastName']}...")
-    response = requests.post(f"{API_URL}/api/bots", headers=headers, json=bot_data)
-    print(f"Status: {response.status_code}")
-    result = response.json()
-    print(f"Response: {json.dumps(result, indent=2)}\n")
-    return result
-
-def get_bot(bot_id):
-    """Get a specific bot instance"""
-    print(f"Getting bot {bot_id}...")
-    response = requests.get(f"{API_URL}/api/bots/{bot_id}", headers=headers)
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}\n")
-
-def delete_bot(bot_id):
-    """Delete a bot instance"""
-    print(f"Deleting bot {bot_id}...")
-    response = requests.delete(f"{API_URL}/api/bots/{bot_id}", headers=headers)
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}\n")
 
 def main():
-    print("=== OpenAI Bot API Test ===\n")
-    
-    # Test 1: Health check
-    test_health()
-    
-    # Test 2: Get all bots (should be empty or show existing from config)
-    print("2. Initial bot list:")
-    get_all_bots()
-    
-    # Test 3: Create first bot
-    print("3. Creating first bot instance:")
-    bot1_data = {
-        "xmppUsername": "support-bot@conference.main.dappros.com",
-        "xmppPassword": "secure_password_123",
-        "firstName": "Support",
-        "lastName": "Bot",
-        "chatroomJid": "support-room@conference.main.dappros.com",
-        "systemPrompt": "You are a technical support assistant. Help users troubleshoot issues and provide clear solutions."
-    }
-    bot1 = create_bot(bot1_data)
-    
-    # Test 4: Create second bot
-    print("4. Creating second bot instance:")
-    bot2_data = {
-        "xmppUsername": "code-bot@conference.main.dappros.com",
-        "xmppPassword": "secure_password_456",
-        "firstName": "Code",
-        "lastName": "Assistant",
-        "chatroomJid": "dev-room@conference.main.dappros.com",
-        "systemPrompt": "You are a programming assistant. Provide code examples, explain algorithms, and help with debugging."
-    }
-    bot2 = create_bot(bot2_data)
-    
-    # Test 5: Get all bots again
-    print("5. Updated bot list:")
-    all_bots = get_all_bots()
-    
-    # Test 6: Get specific bot
-    if all_bots and len(all_bots) > 0:
-        print("6. Getting specific bot details:")
-        get_bot(all_bots[0]['id'])
-    
-    print("\nTest completed!")
-    print("Note: The bots will try to connect to the XMPP server.")
-    print("If the credentials are invalid, you'll see connection errors in the bot manager console.")
-    print("\nTo test with real credentials, update the bot_data dictionaries above with:")
-    print("- Valid XMPP usernames and passwords")
-    print("- Existing chatroom JIDs")
+    parser = argparse.ArgumentParser(description="Concurrent load test for the bot manager API")
+    parser.add_argument("--url", default=API_URL, help=f"API base URL (default {API_URL})")
+    parser.add_argument("--api-key", default=API_KEY, help="Bearer token for /api endpoints")
+    parser.add_argument("--scenario", choices=["create", "list", "delete", "all"], default="all",
+                        help="all = create, get each, list, then delete (default)")
+    parser.add_argument("--specs", default=DEFAULT_SPECS, help="JSON file with bot specs, cycled to --count")
+    parser.add_argument("--count", type=int, default=20, help="bots to create / list calls to make")
+    parser.add_argument("--concurrency", type=int, default=10, help="max requests in flight")
+    parser.add_argument("--id-prefix", default="load-", help="id prefix for created bots; delete only touches these")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--stub", action="store_true", help="run against an in-process stub server")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="artificial stub latency per request (ms)")
+    args = parser.parse_args()
+
+    for option in ("count", "concurrency"):
+        if getattr(args, option) < 1:
+            parser.error(f"--{option} must be at least 1")
+    if args.timeout <= 0:
+        parser.error("--timeout must be positive")
+    if args.stub_latency < 0:
+        parser.error("--stub-latency must not be negative")
+
+    print("=== OpenAI Bot API Load Test ===\n")
+    sys.exit(asyncio.run(run(args)))
+
 
 if __name__ == "__main__":
-    try:
-        main()
-    except requests.exceptions.ConnectionError:
-        print("ERROR: Could not connect to the API server.")
-        print("Make sure the bot manager is running with: npm run dev")
-    except Exception as e:
-        print(f"ERROR: {e}")
\ No newline at end of file
+    main()